@@ -8,41 +8,186 @@ Features: Transaction tracking, recurring entries, visual charts, reports, save/
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
 import sqlite3
+import importlib.util
 import json
 import os
-from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import pandas as pd
-from collections import defaultdict
+import queue
+import threading
+from datetime import date, datetime
+import calendar
+import heapq
+from dataclasses import dataclass
+from functools import lru_cache
 import shutil
 
+# Transaction dates are stored as whole days since this epoch
+EPOCH = datetime(1970, 1, 1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+
+@lru_cache(maxsize=4096)
+def _to_jd(date_str):
+    """Convert a 'YYYY-MM-DD' string to days since EPOCH"""
+    # Imports and bulk adds repeat the same few dates many times over
+    return date.fromisoformat(date_str).toordinal() - EPOCH_ORDINAL
+
+def _to_cents(amount):
+    """Convert a dollar amount to whole cents, rounded as older versions displayed it"""
+    return int(round(round(amount, 2) * 100))
+
+def _stored_date(value):
+    """Read a stored date (older versions saved it unpadded as typed); None if empty, unreadable text unchanged"""
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return value
+
+def _legacy_day(date_str):
+    """Days since EPOCH for a date saved as typed by older versions (e.g. '2024-1-5'), or None"""
+    try:
+        return (datetime.strptime(date_str, '%Y-%m-%d') - EPOCH).days
+    except (TypeError, ValueError):
+        return None
+
 class DatabaseManager:
     """Handles all database operations"""
     
+    TRANSACTIONS_SCHEMA = """
+        CREATE TABLE IF NOT EXISTS {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date INTEGER NOT NULL,
+            description TEXT NOT NULL,
+            category TEXT NOT NULL,
+            amount_cents INTEGER NOT NULL,
+            type TEXT NOT NULL,
+            person TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """
+
+    BUDGET_CATEGORIES_SCHEMA = """
+        CREATE TABLE IF NOT EXISTS {table} (
+            category TEXT PRIMARY KEY,
+            monthly_budget_cents INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        ) WITHOUT ROWID
+    """
+
+    # Recurring frequency -> (step in days, step in months); unknown values run daily
+    FREQUENCY_STEPS = {
+        'daily': (1, 0),
+        'weekly': (7, 0),
+        'bi-weekly': (14, 0),
+        'monthly': (0, 1),
+        'yearly': (0, 12),
+    }
+
+    # Supported filters as (key, condition, parameter conversion), in bitmask order
+    FILTERS = (
+        ('start_date', "date >= ?", _to_jd),
+        ('end_date', "date <= ?", _to_jd),
+        ('category', "category = ?", None),
+        ('person', "person = ?", None),
+        ('type', "type = ?", None),
+    )
+
+    # Groupings aggregate() supports, mapped to their SQL expressions
+    GROUP_COLUMNS = {
+        'category': "category",
+        'person': "person",
+        'type': "type",
+        'month': "strftime('%Y-%m', date * 86400, 'unixepoch')",
+    }
+
+    # Rows keep the historical shape: 'YYYY-MM-DD' dates and dollar amounts
+    TRANSACTION_COLUMNS = ("id, date(date * 86400, 'unixepoch'), description, category, "
+                           "amount_cents / 100.0, type, person, created_at")
+
+    # Distinct transaction queries whose results are kept between writes
+    QUERY_CACHE_SIZE = 64
+
     def __init__(self, db_path="budget.db"):
         self.db_path = db_path
+        # One connection for the lifetime of the manager instead of one per call
+        self._conn = self._connect()
+        
+        # Results of transaction reads, keyed by (SQL, parameters); emptied on every write
+        self._query_cache = {}
+        
+        # WHERE clause and listing query for every filter combination, keyed by bitmask
+        self._where_sql = {}
+        for mask in range(1 << len(self.FILTERS)):
+            conditions = [condition for bit, (_, condition, _) in enumerate(self.FILTERS) if mask & (1 << bit)]
+            self._where_sql[mask] = " WHERE " + " AND ".join(conditions) if conditions else ""
+        self._select_sql = {
+            mask: f"SELECT {self.TRANSACTION_COLUMNS} FROM transactions{where} ORDER BY date DESC, id DESC LIMIT ? OFFSET ?"
+            for mask, where in self._where_sql.items()
+        }
+        self._daily_net_sql = {
+            mask: f"""
+                SELECT date, SUM(CASE WHEN type = 'Income' THEN amount_cents ELSE -amount_cents END)
+                FROM transactions{where}
+                GROUP BY date
+                ORDER BY date
+            """
+            for mask, where in self._where_sql.items()
+        }
+        # aggregate() queries, built on first use and keyed by (grouping, filter bitmask)
+        self._aggregate_sql = {}
         self.init_database()
+
+    def _connect(self):
+        """Open a connection with the per-connection performance pragmas applied"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")
+        # Lets queries round dollar amounts exactly the way stored transactions are
+        conn.create_function("to_cents", 1, _to_cents, deterministic=True)
+        return conn
     
     def init_database(self):
         """Initialize database tables"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn as conn:
             cursor = conn.cursor()
+
+            # WAL lets the GUI keep reading while a write is in progress
+            cursor.execute("PRAGMA journal_mode=WAL")
             
+            # Create and migrate everything atomically
+            cursor.execute("BEGIN")
+
             # Transactions table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS transactions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    date TEXT NOT NULL,
-                    description TEXT NOT NULL,
-                    category TEXT NOT NULL,
-                    amount REAL NOT NULL,
-                    type TEXT NOT NULL,
-                    person TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
+            cursor.execute(self.TRANSACTIONS_SCHEMA.format(table="transactions"))
+
+            # Databases created before dates were day numbers and amounts were cents
+            columns = self._table_columns(cursor, "transactions")
+            if columns['date'].upper() == 'TEXT' or 'amount' in columns:
+                self._migrate_transactions(cursor, columns)
+
+            # Indexes matching get_transactions' ORDER BY and its optional filters
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_tx_date_id ON transactions(date DESC, id DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_tx_category_date ON transactions(category, date DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_tx_person_date ON transactions(person, date DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_tx_type_date ON transactions(type, date DESC)")
+
+            # Lookup key for import's duplicate check. Not UNIQUE: two identical
+            # purchases on the same day are legitimate and add_transaction allows them
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_tx_dedup ON transactions(date, description, amount_cents)")
+
+            # Holds every column the summaries and chart read, so date-ranged (and
+            # unfiltered) aggregates are answered from the index alone
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_tx_cover'")
+            new_cover_index = cursor.fetchone() is None
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_tx_cover ON transactions(date, type, category, person, amount_cents)"
+            )
+
             # Recurring transactions table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS recurring_transactions (
@@ -62,64 +207,205 @@ class DatabaseManager:
             """)
             
             # Budget categories table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS budget_categories (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    category TEXT UNIQUE NOT NULL,
-                    monthly_budget REAL DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
+            cursor.execute(self.BUDGET_CATEGORIES_SCHEMA.format(table="budget_categories"))
+            if 'id' in self._table_columns(cursor, "budget_categories"):
+                self._migrate_budget_categories(cursor)
+            
+            # Collect planner statistics for the new index on existing data;
+            # close() keeps them current afterwards
+            if new_cover_index:
+                cursor.execute("ANALYZE")
             
             conn.commit()
     
+    def close(self):
+        """Refresh planner statistics where SQLite judges them stale, then close the connection"""
+        self._conn.execute("PRAGMA optimize")
+        self._conn.close()
+    
+    def _table_columns(self, cursor, table):
+        """Map a table's column names to their declared types"""
+        return {row[1]: row[2] for row in cursor.execute(f"PRAGMA table_info({table})")}
+    
+    def _migrate_transactions(self, cursor, columns):
+        """Rebuild the transactions table with day-number dates and cent amounts"""
+        if columns['date'].upper() == 'TEXT':
+            # Older versions stored dates as typed, which may be unpadded and
+            # rejected by julianday(); read them the way those versions did
+            self._conn.create_function("legacy_day", 1, _legacy_day, deterministic=True)
+            cursor.execute("SELECT id, date FROM transactions WHERE legacy_day(date) IS NULL LIMIT 5")
+            unreadable = cursor.fetchall()
+            if unreadable:
+                listed = ", ".join(f"#{row_id} ({date!r})" for row_id, date in unreadable)
+                raise sqlite3.DatabaseError(
+                    f"Cannot upgrade {self.db_path}: transactions with dates that are not YYYY-MM-DD: {listed}"
+                )
+            date_expr = "legacy_day(date)"
+        else:
+            date_expr = "date"
+        amount_expr = "to_cents(amount)" if 'amount' in columns else "amount_cents"
+        
+        cursor.execute(self.TRANSACTIONS_SCHEMA.format(table="transactions_new"))
+        cursor.execute(f"""
+            INSERT INTO transactions_new (id, date, description, category, amount_cents, type, person, created_at)
+            SELECT id, {date_expr}, description, category, {amount_expr}, type, person, created_at
+            FROM transactions
+        """)
+        cursor.execute("DROP TABLE transactions")
+        cursor.execute("ALTER TABLE transactions_new RENAME TO transactions")
+    
+    def _migrate_budget_categories(self, cursor):
+        """Rebuild budget_categories keyed by category, with budgets in cents"""
+        cursor.execute(self.BUDGET_CATEGORIES_SCHEMA.format(table="budget_categories_new"))
+        cursor.execute("""
+            INSERT INTO budget_categories_new (category, monthly_budget_cents, created_at)
+            SELECT category, to_cents(monthly_budget), created_at
+            FROM budget_categories
+        """)
+        cursor.execute("DROP TABLE budget_categories")
+        cursor.execute("ALTER TABLE budget_categories_new RENAME TO budget_categories")
+
     def add_transaction(self, date, description, category, amount, trans_type, person):
         """Add a new transaction"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                INSERT INTO transactions (date, description, category, amount, type, person)
+                INSERT INTO transactions (date, description, category, amount_cents, type, person)
                 VALUES (?, ?, ?, ?, ?, ?)
-            """, (date, description, category, amount, trans_type, person))
+            """, (_to_jd(date), description, category, _to_cents(amount), trans_type, person))
             conn.commit()
-            return cursor.lastrowid
+        self.invalidate_cache()
+        return cursor.lastrowid
+    
+    def add_many_transactions(self, rows):
+        """Add several (date, description, category, amount, type, person) rows in one commit"""
+        self._insert_transactions([
+            (_to_jd(date), description, category, _to_cents(amount), trans_type, person)
+            for date, description, category, amount, trans_type, person in rows
+        ])
+    
+    def _insert_transactions(self, rows):
+        """Insert rows already in stored form (day number, ..., cents, ...) in one commit"""
+        with self._conn as conn:
+            conn.executemany("""
+                INSERT INTO transactions (date, description, category, amount_cents, type, person)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, rows)
+            conn.commit()
+        self.invalidate_cache()
+    
+    def _cached_query(self, query, params):
+        """Run a transaction read, reusing the rows of an identical one since the last write"""
+        key = (query, tuple(params))
+        rows = self._query_cache.get(key)
+        if rows is None:
+            with self._conn as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
+            # Drop the oldest entry rather than grow without bound
+            if len(self._query_cache) >= self.QUERY_CACHE_SIZE:
+                del self._query_cache[next(iter(self._query_cache))]
+            self._query_cache[key] = rows
+        return rows
+    
+    def invalidate_cache(self):
+        """Forget cached transaction reads; call after writing to the transactions table"""
+        self._query_cache.clear()
     
-    def get_transactions(self, filters=None):
-        """Get transactions with optional filters"""
-        query = "SELECT * FROM transactions"
+    def _filter_clause(self, filters):
+        """Pick the prebuilt WHERE clause for a filter dict and collect its parameters"""
+        mask = 0
         params = []
         
         if filters:
-            conditions = []
-            if filters.get('start_date'):
-                conditions.append("date >= ?")
-                params.append(filters['start_date'])
-            if filters.get('end_date'):
-                conditions.append("date <= ?")
-                params.append(filters['end_date'])
-            if filters.get('category'):
-                conditions.append("category = ?")
-                params.append(filters['category'])
-            if filters.get('person'):
-                conditions.append("person = ?")
-                params.append(filters['person'])
-            if filters.get('type'):
-                conditions.append("type = ?")
-                params.append(filters['type'])
-            
-            if conditions:
-                query += " WHERE " + " AND ".join(conditions)
-        
-        query += " ORDER BY date DESC, id DESC"
+            for bit, (key, _, convert) in enumerate(self.FILTERS):
+                value = filters.get(key)
+                if value:
+                    mask |= 1 << bit
+                    params.append(convert(value) if convert else value)
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            return cursor.fetchall()
+        return mask, params
+    
+    def transactions_query(self, filters=None, limit=None, offset=0):
+        """Build the SQL and parameters get_transactions runs for these arguments"""
+        mask, params = self._filter_clause(filters)
+        return self._select_sql[mask], params + [-1 if limit is None else limit, offset]
+    
+    def get_transactions(self, filters=None, limit=None, offset=0):
+        """Get transactions with optional filters, optionally one page at a time"""
+        return self._cached_query(*self.transactions_query(filters, limit, offset))
+    
+    def iter_transactions(self, filters=None, batch_size=1000):
+        """Yield transactions in listing order, fetching batch_size rows at a time"""
+        cursor = self._conn.cursor()
+        cursor.arraysize = batch_size
+        cursor.execute(*self.transactions_query(filters))
+        
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                return
+            yield from rows
+    
+    def fetch_batches(self, query, params, batch_size):
+        """Run a read query, yielding lists of up to batch_size rows"""
+        # A connection of its own, so worker threads never share the GUI thread's
+        conn = self._connect()
+        try:
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield rows
+        finally:
+            conn.close()
+    
+    def aggregate(self, group_by=(), filters=None):
+        """Sum transactions per group, returning (*group values, income, expenses, count) rows"""
+        if isinstance(group_by, str):
+            group_by = (group_by,)
+        mask, params = self._filter_clause(filters)
+        
+        query = self._aggregate_sql.get((group_by, mask))
+        if query is None:
+            query = self._aggregate_sql[group_by, mask] = self._build_aggregate_sql(group_by, mask)
+        return self._cached_query(query, params)
+    
+    def _build_aggregate_sql(self, group_by, mask):
+        """Build the aggregate() query for a grouping and filter bitmask"""
+        for column in group_by:
+            if column not in self.GROUP_COLUMNS:
+                raise ValueError(f"Cannot group transactions by {column!r}")
+        
+        expressions = [self.GROUP_COLUMNS[column] for column in group_by]
+        keys = "".join(f"{expression}, " for expression in expressions)
+        # As in the chart, every type other than 'Income' counts as an expense;
+        # callers group by type to single out 'Expense' rows
+        query = f"""
+            SELECT {keys}
+                   COALESCE(SUM(CASE WHEN type = 'Income' THEN amount_cents END), 0) / 100.0,
+                   COALESCE(SUM(CASE WHEN type <> 'Income' THEN amount_cents END), 0) / 100.0,
+                   COUNT(*)
+            FROM transactions{self._where_sql[mask]}
+        """
+        if group_by:
+            query += f" GROUP BY {', '.join(expressions)}"
+        return query
+    
+    def get_daily_net(self, filters=None):
+        """Get the net change of each day with transactions as (day number, net cents) rows, oldest first"""
+        mask, params = self._filter_clause(filters)
+        return self._cached_query(self._daily_net_sql[mask], params)
     
     def add_recurring_transaction(self, description, category, amount, trans_type, person, frequency, start_date, end_date=None):
         """Add a recurring transaction"""
-        with sqlite3.connect(self.db_path) as conn:
+        # Stored as 'YYYY-MM-DD' so the rule can always be read back; bad input raises ValueError
+        start_date = date.fromisoformat(start_date).isoformat()
+        end_date = date.fromisoformat(end_date).isoformat() if end_date else None
+        
+        with self._conn as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT INTO recurring_transactions 
@@ -130,72 +416,113 @@ class DatabaseManager:
             return cursor.lastrowid
     
     def get_recurring_transactions(self):
-        """Get all active recurring transactions"""
-        with sqlite3.connect(self.db_path) as conn:
+        """Get all active recurring transactions, with start, end and last processed dates as date objects"""
+        with self._conn as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM recurring_transactions WHERE active = 1 ORDER BY id")
+            return [rec[:7] + tuple(_stored_date(value) for value in rec[7:10]) + rec[10:] for rec in cursor]
+    
+    def get_recurring_for_display(self):
+        """Get active recurring transactions as the recurring table's formatted rows"""
+        with self._conn as conn:
+            cursor = conn.cursor()
+            # Formatted from whole cents, so the amount matches the transactions the rule creates
+            cursor.execute("""
+                SELECT id, description, category,
+                       printf('%s$%s%d.%02d', CASE WHEN type = 'Income' THEN '' ELSE '-' END,
+                              CASE WHEN cents < 0 THEN '-' ELSE '' END, abs(cents) / 100, abs(cents) % 100),
+                       type, person, frequency, start_date
+                FROM (SELECT *, to_cents(amount) AS cents FROM recurring_transactions)
+                WHERE active = 1
+                ORDER BY id
+            """)
             return cursor.fetchall()
     
     def process_recurring_transactions(self):
         """Process recurring transactions that are due"""
         recurring = self.get_recurring_transactions()
-        processed_count = 0
+        today = date.today().toordinal()
+        new_transactions = []
+        processed = []
         
         for rec in recurring:
             _, description, category, amount, trans_type, person, frequency, start_date, end_date, last_processed, active, _ = rec
             
-            # Calculate next due date
-            start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-            last_processed_dt = datetime.strptime(last_processed, '%Y-%m-%d') if last_processed else start_dt - timedelta(days=1)
-            
-            next_due = self._calculate_next_due_date(last_processed_dt, frequency)
-            today = datetime.now().date()
+            # A rule with an unreadable date is left alone rather than stopping the rest
+            if not all(value is None or isinstance(value, date) for value in (start_date, end_date, last_processed)):
+                print(f"Skipping recurring transaction {rec[0]}: dates must be YYYY-MM-DD")
+                continue
             
-            # Check if due and within end date
-            if next_due <= today:
-                if not end_date or datetime.strptime(end_date, '%Y-%m-%d').date() >= today:
-                    # Add transaction
-                    self.add_transaction(
-                        next_due.strftime('%Y-%m-%d'),
-                        f"{description} (Auto)",
-                        category,
-                        amount,
-                        trans_type,
-                        person
-                    )
-                    
-                    # Update last processed date
-                    with sqlite3.connect(self.db_path) as conn:
-                        cursor = conn.cursor()
-                        cursor.execute("""
-                            UPDATE recurring_transactions 
-                            SET last_processed = ? 
-                            WHERE id = ?
-                        """, (next_due.strftime('%Y-%m-%d'), rec[0]))
-                        conn.commit()
-                    
-                    processed_count += 1
-        
-        return processed_count
-    
-    def _calculate_next_due_date(self, last_date, frequency):
-        """Calculate next due date based on frequency"""
-        if frequency == "daily":
-            return last_date.date() + timedelta(days=1)
-        elif frequency == "weekly":
-            return last_date.date() + timedelta(weeks=1)
-        elif frequency == "bi-weekly":
-            return last_date.date() + timedelta(weeks=2)
-        elif frequency == "monthly":
-            # Add one month
-            if last_date.month == 12:
-                return last_date.replace(year=last_date.year + 1, month=1).date()
+            # Work on day ordinals; the schedule is anchored on the start date
+            start = start_date.toordinal()
+            if last_processed:
+                last = last_processed.toordinal()
+                # Older versions counted from the day before the start date; a rule
+                # they last ran is off this schedule, so carry on from its last run
+                if last not in self._calculate_due_dates(start, last - 1, last, frequency):
+                    start = last
             else:
-                return last_date.replace(month=last_date.month + 1).date()
-        elif frequency == "yearly":
-            return last_date.replace(year=last_date.year + 1).date()
-        else:
-            return last_date.date() + timedelta(days=1)
+                last = start - 1
+            until = min(today, end_date.toordinal()) if end_date else today
+            
+            # Catch up on every occurrence due since the last run
+            due = self._calculate_due_dates(start, last, until, frequency)
+            if due:
+                # Rows go straight in as stored day numbers and cents
+                auto_description = f"{description} (Auto)"
+                amount_cents = _to_cents(amount)
+                new_transactions.extend(
+                    (ordinal - EPOCH_ORDINAL, auto_description, category, amount_cents, trans_type, person)
+                    for ordinal in due
+                )
+                processed.append((date.fromordinal(due[-1]).isoformat(), rec[0]))
+        
+        if processed:
+            with self._conn as conn:
+                # Update last processed dates; _insert_transactions commits
+                # them together with the new rows
+                conn.executemany("""
+                    UPDATE recurring_transactions 
+                    SET last_processed = ? 
+                    WHERE id = ?
+                """, processed)
+                self._insert_transactions(new_transactions)
+        
+        return len(new_transactions)
+    
+    def _calculate_due_dates(self, start, after, until, frequency):
+        """List the day ordinals of occurrences in (after, until] for a schedule starting on `start`"""
+        step, months = self.FREQUENCY_STEPS.get(frequency, (1, 0))
+        if months:
+            return self._monthly_due_dates(start, after, until, months)
+        
+        return self._expand_schedule(start, after, until, step)
+    
+    def _expand_schedule(self, start, after, until, step):
+        """Ordinals start + k*step in (after, until], as a lazy range"""
+        # First occurrence strictly after `after`
+        first = start + max(0, -((start - after - 1) // step)) * step
+        return range(first, until + 1, step)
+    
+    def _monthly_due_dates(self, start, after, until, months):
+        """Like _calculate_due_dates for a `months` step, clamping to each month's last day"""
+        anchor = date.fromordinal(start)
+        base = anchor.year * 12 + anchor.month - 1
+        
+        # Skip straight to the occurrence in (or just before) the month of `after`
+        after_date = date.fromordinal(max(after, start))
+        k = (after_date.year * 12 + after_date.month - 1 - base) // months
+        
+        due = []
+        while True:
+            year, month = divmod(base + k * months, 12)
+            day = min(anchor.day, calendar.monthrange(year, month + 1)[1])
+            ordinal = date(year, month + 1, day).toordinal()
+            if ordinal > until:
+                return due
+            if ordinal > after:
+                due.append(ordinal)
+            k += 1
 
 class SaveLoadManager:
     """Handles save/load functionality for sharing between devices"""
@@ -206,89 +533,164 @@ class SaveLoadManager:
     def export_data(self, filepath):
         """Export all data to a JSON file"""
         try:
-            data = {
-                'transactions': self.db_manager.get_transactions(),
-                'recurring_transactions': self.db_manager.get_recurring_transactions(),
-                'export_date': datetime.now().isoformat(),
-                'version': '1.0'
-            }
-            
+            # Written row by row so the full table is never held in memory
             with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+                f.write('{\n  "transactions": [')
+                self._write_rows(f, self.db_manager.iter_transactions())
+                f.write('],\n  "recurring_transactions": [')
+                self._write_rows(f, self.db_manager.get_recurring_transactions())
+                f.write('],\n')
+                f.write(f'  "export_date": {json.dumps(datetime.now().isoformat())},\n')
+                f.write('  "version": "1.0"\n}\n')
             
             return True
         except Exception as e:
             print(f"Export error: {e}")
             return False
     
+    def _write_rows(self, f, rows):
+        """Write rows as the elements of a JSON array, one per line"""
+        encode = json.JSONEncoder(default=str).encode
+        for index, row in enumerate(rows):
+            f.write(",\n    " if index else "\n    ")
+            f.write(encode(row))
+        f.write("\n  ")
+    
     def import_data(self, filepath, merge=True):
         """Import data from a JSON file"""
         try:
             with open(filepath, 'r') as f:
                 data = json.load(f)
             
-            if not merge:
-                # Clear existing data
-                with sqlite3.connect(self.db_manager.db_path) as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("DELETE FROM transactions")
-                    cursor.execute("DELETE FROM recurring_transactions")
-                    conn.commit()
+            transactions = [
+                (_to_jd(trans[1]), trans[2], trans[3], _to_cents(trans[4]), trans[5], trans[6])
+                for trans in data.get('transactions', [])
+            ]
+            recurring = [tuple(rec[1:10]) for rec in data.get('recurring_transactions', [])]
             
-            # Import transactions
-            for trans in data.get('transactions', []):
-                # Skip if already exists (for merge mode)
-                if merge:
-                    existing = self.db_manager.get_transactions({
-                        'start_date': trans[1],
-                        'end_date': trans[1]
-                    })
-                    if any(t[2] == trans[2] and t[4] == trans[4] and t[1] == trans[1] for t in existing):
-                        continue
+            with self.db_manager._conn as conn:
+                cursor = conn.cursor()
+                cursor.execute("BEGIN")
                 
-                self.db_manager.add_transaction(
-                    trans[1], trans[2], trans[3], trans[4], trans[5], trans[6]
-                )
-            
-            # Import recurring transactions
-            for rec in data.get('recurring_transactions', []):
-                if merge:
-                    # Check if similar recurring transaction exists
-                    existing_rec = self.db_manager.get_recurring_transactions()
-                    if any(r[1] == rec[1] and r[4] == rec[4] and r[6] == rec[6] for r in existing_rec):
-                        continue
+                if not merge:
+                    # Clear existing data
+                    cursor.execute("DELETE FROM transactions")
+                    cursor.execute("DELETE FROM recurring_transactions")
+                    
+                    cursor.executemany("""
+                        INSERT INTO transactions (date, description, category, amount_cents, type, person)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    """, transactions)
+                    cursor.executemany("""
+                        INSERT INTO recurring_transactions
+                        (description, category, amount, type, person, frequency, start_date, end_date, last_processed)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, recurring)
+                else:
+                    # Stage the incoming rows and skip existing ones (and repeats within
+                    # the file) with one anti-join per table instead of a lookup per row
+                    cursor.execute("CREATE TEMP TABLE import_transactions AS SELECT * FROM transactions WHERE 0")
+                    cursor.executemany("""
+                        INSERT INTO import_transactions (date, description, category, amount_cents, type, person)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    """, transactions)
+                    cursor.execute("""
+                        INSERT INTO transactions (date, description, category, amount_cents, type, person)
+                        SELECT s.date, s.description, s.category, s.amount_cents, s.type, s.person
+                        FROM import_transactions s
+                        WHERE s.rowid IN (
+                            SELECT MIN(rowid) FROM import_transactions GROUP BY date, description, amount_cents
+                        )
+                        AND NOT EXISTS (
+                            SELECT 1 FROM transactions t
+                            WHERE t.date = s.date AND t.description = s.description AND t.amount_cents = s.amount_cents
+                        )
+                        ORDER BY s.rowid
+                    """)
+                    cursor.execute("DROP TABLE temp.import_transactions")
+                    
+                    cursor.execute("CREATE TEMP TABLE import_recurring AS SELECT * FROM recurring_transactions WHERE 0")
+                    cursor.executemany("""
+                        INSERT INTO import_recurring
+                        (description, category, amount, type, person, frequency, start_date, end_date, last_processed)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, recurring)
+                    cursor.execute("""
+                        INSERT INTO recurring_transactions
+                        (description, category, amount, type, person, frequency, start_date, end_date, last_processed)
+                        SELECT s.description, s.category, s.amount, s.type, s.person, s.frequency,
+                               s.start_date, s.end_date, s.last_processed
+                        FROM import_recurring s
+                        WHERE s.rowid IN (
+                            SELECT MIN(rowid) FROM import_recurring GROUP BY description, type, frequency
+                        )
+                        AND NOT EXISTS (
+                            SELECT 1 FROM recurring_transactions r
+                            WHERE r.active = 1 AND r.description = s.description
+                            AND r.type = s.type AND r.frequency = s.frequency
+                        )
+                        ORDER BY s.rowid
+                    """)
+                    cursor.execute("DROP TABLE temp.import_recurring")
                 
-                self.db_manager.add_recurring_transaction(
-                    rec[1], rec[2], rec[3], rec[4], rec[5], rec[6], rec[7], rec[8]
-                )
+                conn.commit()
+            self.db_manager.invalidate_cache()
             
             return True
         except Exception as e:
             print(f"Import error: {e}")
             return False
 
+@dataclass
+class BalanceView:
+    """Everything the chart and summary show for the current date filters"""
+    dates: "numpy.ndarray"
+    balances: "numpy.ndarray"
+    total_income: float
+    total_expenses: float
+    categories: dict
+    person_stats: dict
+
 class BudgetApp:
     """Main application class"""
     
+    # Rows fetched into the transactions table at a time, and handed
+    # from the fetching thread to the GUI thread at a time
+    PAGE_SIZE = 500
+    BATCH_SIZE = 200
+    
+    TITLE = "Personal Budget Manager - CM™"
+    
     def __init__(self, root):
         self.root = root
-        self.root.title("Personal Budget Manager - CM)
+        self.root.title(self.TITLE)
         self.root.geometry("1200x800")
         
+        # Set while a coalesced refresh is scheduled but has not run yet
+        self._refresh_pending = False
+        
+        # Incremented whenever the transactions table is reloaded from the top
+        self.tree_generation = 0
+        
+        # Paging state for the table; marked exhausted until the first refresh so
+        # the tree's first scroll callback does not fetch a page early
+        self.tree_filters = {}
+        self.tree_loaded = 0
+        self.tree_loading = False
+        self.tree_exhausted = True
+        
         # Initialize managers
         self.db_manager = DatabaseManager()
         self.save_load_manager = SaveLoadManager(self.db_manager)
         
-        # Process recurring transactions on startup
-        self.db_manager.process_recurring_transactions()
+        # Process recurring transactions on startup; main() reports the count
+        self.recurring_processed = self.db_manager.process_recurring_transactions()
         
         # Create GUI
         self.create_gui()
         
         # Refresh data
-        self.refresh_transactions()
-        self.update_chart()
-        self.update_summary()
+        self._schedule_refresh()
     
     def create_gui(self):
         """Create the main GUI"""
@@ -301,11 +703,25 @@ class BudgetApp:
         self.create_recurring_tab()
         self.create_reports_tab()
         self.create_settings_tab()
+        
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+    
+    def on_tab_changed(self, event):
+        """Track whether the chart's tab is showing and catch the chart up when it is"""
+        self.chart_visible = self.notebook.select() == str(self.chart_tab)
+        if self.chart_visible and self.chart_dirty:
+            try:
+                view = self._compute_view()
+                self.update_chart(view)
+                self.update_summary(view)
+            except ValueError:
+                messagebox.showerror("Error", "Please enter filter dates as YYYY-MM-DD")
     
     def create_main_tab(self):
         """Create main transactions tab"""
         main_frame = ttk.Frame(self.notebook)
         self.notebook.add(main_frame, text="Transactions")
+        self.chart_tab = main_frame
         
         # Top frame for entry and controls
         top_frame = ttk.Frame(main_frame)
@@ -395,7 +811,8 @@ class BudgetApp:
                 self.tree.column(col, width=120)
         
         scrollbar = ttk.Scrollbar(left_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree_scrollbar = scrollbar
+        self.tree.configure(yscrollcommand=self.on_tree_scroll)
         
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
@@ -415,10 +832,40 @@ class BudgetApp:
         chart_frame = ttk.LabelFrame(right_frame, text="Balance Over Time")
         chart_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Create matplotlib figure
-        self.fig, self.ax = plt.subplots(figsize=(6, 4))
+        # Create matplotlib figure (imported here to keep it off the module import path;
+        # the canvas embeds a plain Figure, so pyplot is never loaded)
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        self.fig = Figure(figsize=(6, 4))
+        self.ax = self.fig.add_subplot()
         self.canvas = FigureCanvasTkAgg(self.fig, chart_frame)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.setup_chart()
+    
+    def setup_chart(self):
+        """Create the persistent chart artists that update_chart blits"""
+        self.ax.set_title('Balance Over Time')
+        self.ax.set_xlabel('Date')
+        self.ax.set_ylabel('Balance ($)')
+        self.ax.grid(True, alpha=0.3)
+        self.ax.xaxis_date()
+        self.no_data_text = self.ax.text(0.5, 0.5, 'No data to display', ha='center', va='center',
+                                         transform=self.ax.transAxes, visible=False)
+        
+        # The line is animated so full draws leave it out of the saved background
+        self.balance_line, = self.ax.plot([], [], marker='o', linewidth=2, animated=True)
+        self.chart_background = None
+        self.chart_layout = None
+        
+        # Updates while another tab is showing are put off until it is shown again
+        self.chart_visible = True
+        self.chart_dirty = False
+        self.canvas.mpl_connect('draw_event', self.on_chart_draw)
+    
+    def on_chart_draw(self, event):
+        """Save the freshly drawn background and put the balance line back on top"""
+        self.chart_background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.ax.draw_artist(self.balance_line)
     
     def create_recurring_tab(self):
         """Create recurring transactions tab"""
@@ -531,8 +978,6 @@ class BudgetApp:
         
         self.info_text = tk.Text(info_frame, height=10, wrap=tk.WORD)
         self.info_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        self.update_info()
     
     def add_transaction(self):
         """Add a new transaction"""
@@ -556,14 +1001,12 @@ class BudgetApp:
             self.date_var.set(datetime.now().strftime('%Y-%m-%d'))
             
             # Refresh displays
-            self.refresh_transactions()
-            self.update_chart()
-            self.update_summary()
+            self._schedule_refresh()
             
             messagebox.showinfo("Success", "Transaction added successfully!")
             
         except ValueError:
-            messagebox.showerror("Error", "Please enter a valid amount")
+            messagebox.showerror("Error", "Please enter a valid amount and a date as YYYY-MM-DD")
         except Exception as e:
             messagebox.showerror("Error", f"Error adding transaction: {str(e)}")
     
@@ -595,15 +1038,14 @@ class BudgetApp:
             messagebox.showinfo("Success", "Recurring transaction added successfully!")
             
         except ValueError:
-            messagebox.showerror("Error", "Please enter a valid amount")
+            messagebox.showerror("Error", "Please enter a valid amount and a start date as YYYY-MM-DD")
         except Exception as e:
             messagebox.showerror("Error", f"Error adding recurring transaction: {str(e)}")
     
     def refresh_transactions(self):
         """Refresh the transactions table"""
         # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.tree.delete(*self.tree.get_children())
         
         # Get current filters
         filters = {}
@@ -614,132 +1056,203 @@ class BudgetApp:
         if self.filter_cat_var.get() and self.filter_cat_var.get() != 'All':
             filters['category'] = self.filter_cat_var.get()
         
-        transactions = self.db_manager.get_transactions(filters)
-        
-        for trans in transactions:
-            # Format amount with proper sign and color
-            amount = trans[4]
-            if trans[5] == 'Expense':
-                amount_str = f"-${abs(amount):.2f}"
-                tags = ('expense',)
-            else:
-                amount_str = f"+${amount:.2f}"
-                tags = ('income',)
-            
-            self.tree.insert('', 'end', values=(
-                trans[0], trans[1], trans[2], trans[3], 
-                amount_str, trans[5], trans[6]
-            ), tags=tags)
+        # Rows are loaded a page at a time as the table is scrolled; bumping the
+        # generation abandons any page still being fetched for the old filters
+        self.tree_filters = filters
+        self.tree_generation += 1
+        self.tree_loaded = 0
+        self.tree_exhausted = False
+        self.tree_loading = False
+        self.load_more_transactions()
         
         # Configure tags for coloring
         self.tree.tag_configure('expense', foreground='red')
         self.tree.tag_configure('income', foreground='green')
     
+    def load_more_transactions(self):
+        """Start fetching the next page of transactions into the table"""
+        if self.tree_exhausted:
+            self.tree_loading = False
+            return
+        
+        # The query is built here so bad filter values raise on the GUI thread;
+        # the fetch and row formatting run on a worker with its own connection
+        self.tree_loading = True
+        query, params = self.db_manager.transactions_query(
+            self.tree_filters, limit=self.PAGE_SIZE, offset=self.tree_loaded
+        )
+        batches = queue.Queue()
+        threading.Thread(
+            target=self._fetch_transactions, args=(query, params, batches), daemon=True
+        ).start()
+        self.root.after(10, self._drain_transactions, self.tree_generation, batches, 0)
+    
+    def _fetch_transactions(self, query, params, batches):
+        """Worker thread: fetch and format one page, then post None to mark its end"""
+        try:
+            for rows in self.db_manager.fetch_batches(query, params, self.BATCH_SIZE):
+                batches.put([self._format_transaction(trans) for trans in rows])
+        finally:
+            batches.put(None)
+    
+    def _format_transaction(self, trans):
+        """Table values and tags for a transaction row"""
+        # Format amount with proper sign and color
+        amount = trans[4]
+        if trans[5] == 'Expense':
+            amount_str = f"-${abs(amount):.2f}"
+            tags = ('expense',)
+        else:
+            amount_str = f"+${amount:.2f}"
+            tags = ('income',)
+        
+        return (trans[0], trans[1], trans[2], trans[3], amount_str, trans[5], trans[6]), tags
+    
+    def _drain_transactions(self, generation, batches, received):
+        """Insert the batches fetched so far, polling again until the page is complete"""
+        if generation != self.tree_generation:
+            return
+        
+        try:
+            while True:
+                batch = batches.get_nowait()
+                if batch is None:
+                    self.tree_exhausted = received < self.PAGE_SIZE
+                    self.tree_loading = False
+                    return
+                for values, tags in batch:
+                    self.tree.insert('', 'end', values=values, tags=tags)
+                received += len(batch)
+                self.tree_loaded += len(batch)
+        except queue.Empty:
+            self.root.after(10, self._drain_transactions, generation, batches, received)
+    
+    def on_tree_scroll(self, first, last):
+        """Track the table's scroll position and fetch another page near the bottom"""
+        self.tree_scrollbar.set(first, last)
+        if float(last) > 0.9 and not self.tree_exhausted and not self.tree_loading:
+            self.load_more_transactions()
+    
     def refresh_recurring(self):
         """Refresh the recurring transactions table"""
         for item in self.rec_tree.get_children():
             self.rec_tree.delete(item)
         
-        recurring = self.db_manager.get_recurring_transactions()
-        for rec in recurring:
-            amount_str = f"${rec[3]:.2f}" if rec[4] == 'Income' else f"-${rec[3]:.2f}"
-            self.rec_tree.insert('', 'end', values=(
-                rec[0], rec[1], rec[2], amount_str, rec[4], rec[5], rec[6], rec[7]
-            ))
+        for row in self.db_manager.get_recurring_for_display():
+            self.rec_tree.insert('', 'end', values=row)
     
     def apply_filters(self):
         """Apply current filters to transaction view"""
-        self.refresh_transactions()
-        self.update_chart()
-        self.update_summary()
+        self._schedule_refresh()
     
     def clear_filters(self):
         """Clear all filters"""
         self.filter_start_var.set("")
         self.filter_end_var.set("")
         self.filter_cat_var.set("All")
-        self.refresh_transactions()
-        self.update_chart()
-        self.update_summary()
+        self._schedule_refresh()
     
-    def update_chart(self):
-        """Update the balance over time chart"""
-        # Get transactions for chart
+    def _schedule_refresh(self):
+        """Refresh the table, chart, summary and database info once for a burst of changes"""
+        # Requests made while one is pending are covered by it, since the
+        # refresh reads the current filters and data when it runs
+        if self._refresh_pending:
+            return
+        self._refresh_pending = True
+        self.root.after(150, self._do_refresh)
+    
+    def _do_refresh(self):
+        """Run a refresh scheduled by _schedule_refresh"""
+        self._refresh_pending = False
+        try:
+            self.refresh_transactions()
+            # The chart and summary share a tab; skip their queries until it is shown
+            if self.chart_visible:
+                view = self._compute_view()
+                self.update_chart(view)
+                self.update_summary(view)
+            else:
+                self.chart_dirty = True
+            self.update_info()
+        except ValueError:
+            messagebox.showerror("Error", "Please enter filter dates as YYYY-MM-DD")
+    
+    def _compute_view(self):
+        """Gather the chart and summary figures for the current date filters in one pass"""
         filters = {}
         if self.filter_start_var.get():
             filters['start_date'] = self.filter_start_var.get()
         if self.filter_end_var.get():
             filters['end_date'] = self.filter_end_var.get()
         
-        transactions = self.db_manager.get_transactions(filters)
-        
-        # Calculate running balance
-        balance_data = defaultdict(float)
-        dates = []
-        balances = []
-        
-        # Sort by date
-        transactions.sort(key=lambda x: x[1])
-        
-        running_balance = 0
-        for trans in transactions:
-            date = trans[1]
-            amount = trans[4] if trans[5] == 'Income' else -trans[4]
-            running_balance += amount
-            
-            dates.append(datetime.strptime(date, '%Y-%m-%d'))
-            balances.append(running_balance)
-        
-        # Clear and plot
-        self.ax.clear()
-        if dates and balances:
-            self.ax.plot(dates, balances, marker='o', linewidth=2)
-            self.ax.set_title('Balance Over Time')
-            self.ax.set_xlabel('Date')
-            self.ax.set_ylabel('Balance ($)')
-            self.ax.grid(True, alpha=0.3)
-            
-            # Color coding
-            if balances[-1] >= 0:
-                self.ax.plot(dates, balances, color='green', marker='o', linewidth=2)
-            else:
-                self.ax.plot(dates, balances, color='red', marker='o', linewidth=2)
+        # Daily running balance for the chart: day numbers convert straight to
+        # datetime64 and a cumulative sum of the daily nets gives the balance
+        import numpy as np  # installed with matplotlib
+        daily = np.array(self.db_manager.get_daily_net(filters), dtype=np.int64).reshape(-1, 2)
+        dates = daily[:, 0].astype('datetime64[D]')
+        balances = np.cumsum(daily[:, 1]) / 100.0
+        
+        # Totals, expense categories and person breakdown all come from
+        # a single grouping walked once
+        total_income = total_expenses = 0
+        categories = {}
+        person_stats = {}
+        for trans_type, category, person, income, expenses, _ in self.db_manager.aggregate(
+                ('type', 'category', 'person'), filters):
+            total_income += income
+            if trans_type == 'Expense':
+                total_expenses += expenses
+                categories[category] = categories.get(category, 0) + expenses
+            stats = person_stats.setdefault(person, {'income': 0, 'expenses': 0})
+            stats['income'] += income
+            stats['expenses'] += expenses
+        
+        return BalanceView(dates, balances, total_income, total_expenses,
+                           categories, dict(sorted(person_stats.items())))
+    
+    def update_chart(self, view=None):
+        """Update the balance over time chart"""
+        if not self.chart_visible:
+            self.chart_dirty = True
+            return
+        self.chart_dirty = False
+        
+        if view is None:
+            view = self._compute_view()
+        dates, balances = view.dates, view.balances
+        
+        # Update the line in place, color coded by the closing balance
+        has_data = len(dates) > 0
+        self.balance_line.set_data(dates, balances)
+        self.balance_line.set_color('green' if has_data and balances[-1] >= 0 else 'red')
+        self.no_data_text.set_visible(not has_data)
+        if has_data:
+            self.ax.relim()
+            self.ax.autoscale_view()
+        
+        # Only a change of axis range (or of the empty state) needs a full redraw;
+        # otherwise restore the saved background and blit just the line
+        layout = (self.ax.get_xlim(), self.ax.get_ylim(), has_data)
+        if self.chart_background is None or layout != self.chart_layout:
+            self.chart_layout = layout
+            self.fig.autofmt_xdate()
+            # Deferred to idle time so back-to-back updates share one full draw
+            self.canvas.draw_idle()
         else:
-            self.ax.text(0.5, 0.5, 'No data to display', ha='center', va='center', transform=self.ax.transAxes)
-        
-        self.fig.autofmt_xdate()
-        self.canvas.draw()
+            self.canvas.restore_region(self.chart_background)
+            self.ax.draw_artist(self.balance_line)
+            self.canvas.blit(self.fig.bbox)
     
-    def update_summary(self):
+    def update_summary(self, view=None):
         """Update the summary text"""
-        filters = {}
-        if self.filter_start_var.get():
-            filters['start_date'] = self.filter_start_var.get()
-        if self.filter_end_var.get():
-            filters['end_date'] = self.filter_end_var.get()
-        
-        transactions = self.db_manager.get_transactions(filters)
-        
-        total_income = sum(t[4] for t in transactions if t[5] == 'Income')
-        total_expenses = sum(t[4] for t in transactions if t[5] == 'Expense')
+        if view is None:
+            view = self._compute_view()
+        total_income, total_expenses = view.total_income, view.total_expenses
         net_balance = total_income - total_expenses
+        categories = view.categories
+        person_stats = view.person_stats
         
-        # Category breakdown
-        categories = defaultdict(float)
-        for trans in transactions:
-            if trans[5] == 'Expense':
-                categories[trans[3]] += trans[4]
-        
-        # Person breakdown
-        person_stats = defaultdict(lambda: {'income': 0, 'expenses': 0})
-        for trans in transactions:
-            person = trans[6]
-            if trans[5] == 'Income':
-                person_stats[person]['income'] += trans[4]
-            else:
-                person_stats[person]['expenses'] += trans[4]
-        
-        summary = f"""FINANCIAL SUMMARY
+        parts = [f"""FINANCIAL SUMMARY
 {'='*30}
 
 Total Income: ${total_income:.2f}
@@ -747,19 +1260,25 @@ Total Expenses: ${total_expenses:.2f}
 Net Balance: ${net_balance:.2f}
 
 TOP EXPENSE CATEGORIES:
-"""
+"""]
         
-        sorted_categories = sorted(categories.items(), key=lambda x: x[1], reverse=True)[:5]
+        sorted_categories = heapq.nlargest(5, categories.items(), key=lambda x: x[1])
         for cat, amount in sorted_categories:
-            summary += f"{cat}: ${amount:.2f}\n"
+            parts.append(f"{cat}: ${amount:.2f}\n")
         
-        summary += f"\nPERSON BREAKDOWN:\n"
+        parts.append("\nPERSON BREAKDOWN:\n")
         for person, stats in person_stats.items():
             net = stats['income'] - stats['expenses']
-            summary += f"{person}:\n  Income: ${stats['income']:.2f}\n  Expenses: ${stats['expenses']:.2f}\n  Net: ${net:.2f}\n\n"
+            parts.append(f"{person}:\n  Income: ${stats['income']:.2f}\n  Expenses: ${stats['expenses']:.2f}\n  Net: ${net:.2f}\n\n")
         
-        self.summary_text.delete(1.0, tk.END)
-        self.summary_text.insert(1.0, summary)
+        summary = "".join(parts)
+        self._show_text(self.summary_text, summary)
+    
+    def _show_text(self, widget, text):
+        """Swap a read-only text widget's contents in a single edit"""
+        widget.configure(state=tk.NORMAL)
+        widget.replace('1.0', tk.END, text)
+        widget.configure(state=tk.DISABLED)
     
     def generate_monthly_report(self):
         """Generate monthly spending report"""
@@ -767,18 +1286,18 @@ TOP EXPENSE CATEGORIES:
         start_date = now.replace(day=1).strftime('%Y-%m-%d')
         end_date = now.strftime('%Y-%m-%d')
         
+        # Totals, count and expense categories all come from one grouping by type and category
         filters = {'start_date': start_date, 'end_date': end_date}
-        transactions = self.db_manager.get_transactions(filters)
-        
-        total_income = sum(t[4] for t in transactions if t[5] == 'Income')
-        total_expenses = sum(t[4] for t in transactions if t[5] == 'Expense')
-        
-        categories = defaultdict(float)
-        for trans in transactions:
-            if trans[5] == 'Expense':
-                categories[trans[3]] += trans[4]
-        
-        report = f"""MONTHLY REPORT - {now.strftime('%B %Y')}
+        total_income = total_expenses = count = 0
+        categories = {}
+        for trans_type, cat, income, expenses, group_count in self.db_manager.aggregate(('type', 'category'), filters):
+            total_income += income
+            count += group_count
+            if trans_type == 'Expense':
+                total_expenses += expenses
+                categories[cat] = expenses
+        
+        parts = [f"""MONTHLY REPORT - {now.strftime('%B %Y')}
 {'='*50}
 
 SUMMARY:
@@ -787,93 +1306,86 @@ Total Expenses: ${total_expenses:.2f}
 Net Savings: ${total_income - total_expenses:.2f}
 
 EXPENSES BY CATEGORY:
-"""
+"""]
         
         sorted_categories = sorted(categories.items(), key=lambda x: x[1], reverse=True)
         for cat, amount in sorted_categories:
             percentage = (amount / total_expenses * 100) if total_expenses > 0 else 0
-            report += f"{cat}: ${amount:.2f} ({percentage:.1f}%)\n"
+            parts.append(f"{cat}: ${amount:.2f} ({percentage:.1f}%)\n")
         
-        report += f"\nTRANSACTION COUNT: {len(transactions)}\n"
-        report += f"AVERAGE TRANSACTION: ${(total_income + total_expenses) / len(transactions):.2f}\n" if transactions else ""
+        parts.append(f"\nTRANSACTION COUNT: {count}\n")
+        if count:
+            parts.append(f"AVERAGE TRANSACTION: ${(total_income + total_expenses) / count:.2f}\n")
         
-        self.report_text.delete(1.0, tk.END)
-        self.report_text.insert(1.0, report)
+        # Income/expenses per month over the last year
+        year, month = divmod(now.year * 12 + now.month - 12, 12)
+        history_filters = {'start_date': f"{year:04d}-{month + 1:02d}-01", 'end_date': end_date}
+        history = sorted(self.db_manager.aggregate('month', history_filters))
+        
+        parts.append(f"\nLAST 12 MONTHS:\n{'Month':<9}{'Income':>13}{'Expenses':>13}{'Net':>13}\n")
+        for month_key, income, expenses, _ in history:
+            parts.append(f"{month_key:<9}{income:>13.2f}{expenses:>13.2f}{income - expenses:>13.2f}\n")
+        
+        report = "".join(parts)
+        self._show_text(self.report_text, report)
     
     def generate_category_report(self):
         """Generate category spending report"""
-        transactions = self.db_manager.get_transactions()
-        
-        categories = defaultdict(lambda: {'count': 0, 'total': 0, 'avg': 0})
+        categories = {}
+        for cat, income, expenses, count in self.db_manager.aggregate('category'):
+            total = income + expenses
+            categories[cat] = {'count': count, 'total': total, 'avg': total / count}
         
-        for trans in transactions:
-            cat = trans[3]
-            amount = trans[4]
-            categories[cat]['count'] += 1
-            categories[cat]['total'] += amount
-        
-        for cat in categories:
-            categories[cat]['avg'] = categories[cat]['total'] / categories[cat]['count']
-        
-        report = f"""CATEGORY ANALYSIS REPORT
+        parts = [f"""CATEGORY ANALYSIS REPORT
 {'='*50}
 
-"""
+"""]
         
         sorted_categories = sorted(categories.items(), key=lambda x: x[1]['total'], reverse=True)
         for cat, stats in sorted_categories:
-            report += f"{cat.upper()}:\n"
-            report += f"  Total Spent: ${stats['total']:.2f}\n"
-            report += f"  Transaction Count: {stats['count']}\n"
-            report += f"  Average per Transaction: ${stats['avg']:.2f}\n\n"
+            parts.append(f"{cat.upper()}:\n")
+            parts.append(f"  Total Spent: ${stats['total']:.2f}\n")
+            parts.append(f"  Transaction Count: {stats['count']}\n")
+            parts.append(f"  Average per Transaction: ${stats['avg']:.2f}\n\n")
         
-        self.report_text.delete(1.0, tk.END)
-        self.report_text.insert(1.0, report)
+        report = "".join(parts)
+        self._show_text(self.report_text, report)
     
     def generate_person_report(self):
         """Generate person-based spending report"""
-        transactions = self.db_manager.get_transactions()
-        
-        person_stats = defaultdict(lambda: {
-            'income': 0, 'expenses': 0, 'transactions': 0,
-            'categories': defaultdict(float)
-        })
-        
-        for trans in transactions:
-            person = trans[6]
-            amount = trans[4]
-            category = trans[3]
-            trans_type = trans[5]
-            
-            person_stats[person]['transactions'] += 1
-            if trans_type == 'Income':
-                person_stats[person]['income'] += amount
-            else:
-                person_stats[person]['expenses'] += amount
-                person_stats[person]['categories'][category] += amount
-        
-        report = f"""PERSON-BASED SPENDING REPORT
+        # Every person with expenses also has a row in the per-person totals
+        person_stats = {
+            person: {'income': income, 'expenses': expenses, 'transactions': count, 'categories': {}}
+            for person, income, expenses, count in self.db_manager.aggregate('person')
+        }
+        
+        for person, trans_type, category, _, expenses, _ in self.db_manager.aggregate(('person', 'type', 'category')):
+            if trans_type != 'Income':
+                categories = person_stats[person]['categories']
+                categories[category] = categories.get(category, 0) + expenses
+        
+        parts = [f"""PERSON-BASED SPENDING REPORT
 {'='*50}
 
-"""
+"""]
         
         for person, stats in person_stats.items():
             net = stats['income'] - stats['expenses']
-            report += f"{person.upper()}:\n"
-            report += f"  Total Income: ${stats['income']:.2f}\n"
-            report += f"  Total Expenses: ${stats['expenses']:.2f}\n"
-            report += f"  Net Balance: ${net:.2f}\n"
-            report += f"  Total Transactions: {stats['transactions']}\n"
+            parts.append(f"{person.upper()}:\n")
+            parts.append(f"  Total Income: ${stats['income']:.2f}\n")
+            parts.append(f"  Total Expenses: ${stats['expenses']:.2f}\n")
+            parts.append(f"  Net Balance: ${net:.2f}\n")
+            parts.append(f"  Total Transactions: {stats['transactions']}\n")
             
             if stats['categories']:
-                report += f"  Top Categories:\n"
-                top_cats = sorted(stats['categories'].items(), key=lambda x: x[1], reverse=True)[:3]
+                parts.append("  Top Categories:\n")
+                top_cats = heapq.nlargest(3, stats['categories'].items(), key=lambda x: x[1])
                 for cat, amount in top_cats:
-                    report += f"    {cat}: ${amount:.2f}\n"
-            report += "\n"
+                    parts.append(f"    {cat}: ${amount:.2f}\n")
+            parts.append("\n")
         
-        self.report_text.delete(1.0, tk.END)
-        self.report_text.insert(1.0, report)
+        report = "".join(parts)
+        self._show_text(self.report_text, report)
     
     def export_data(self):
         """Export data to file"""
@@ -905,28 +1417,30 @@ EXPENSES BY CATEGORY:
             
             if confirm:
                 if self.save_load_manager.import_data(filename, merge):
-                    self.refresh_transactions()
                     self.refresh_recurring()
-                    self.update_chart()
-                    self.update_summary()
-                    self.update_info()
+                    self._schedule_refresh()
                     messagebox.showinfo("Success", "Data imported successfully!")
                 else:
                     messagebox.showerror("Error", "Failed to import data")
     
     def update_info(self):
         """Update database information"""
-        transactions = self.db_manager.get_transactions()
+        # Only the newest rows are listed; totals and the count come from SQL
+        recent_transactions = self.db_manager.get_transactions(limit=5)
         recurring = self.db_manager.get_recurring_transactions()
         
-        total_income = sum(t[4] for t in transactions if t[5] == 'Income')
-        total_expenses = sum(t[4] for t in transactions if t[5] == 'Expense')
+        total_income = total_expenses = count = 0
+        for trans_type, income, expenses, group_count in self.db_manager.aggregate('type'):
+            total_income += income
+            count += group_count
+            if trans_type == 'Expense':
+                total_expenses += expenses
         
-        info = f"""DATABASE INFORMATION
+        parts = [f"""DATABASE INFORMATION
 {'='*30}
 
 Database Path: {self.db_manager.db_path}
-Total Transactions: {len(transactions)}
+Total Transactions: {count}
 Recurring Transactions: {len(recurring)}
 
 All-Time Summary:
@@ -935,41 +1449,43 @@ Total Expenses: ${total_expenses:.2f}
 Net Balance: ${total_income - total_expenses:.2f}
 
 Recent Activity:
-"""
+"""]
         
-        recent_transactions = transactions[:5]  # Last 5 transactions
         for trans in recent_transactions:
             date = trans[1]
             desc = trans[2][:20] + "..." if len(trans[2]) > 20 else trans[2]
             amount = trans[4]
-            info += f"{date}: {desc} - ${amount:.2f}\n"
+            parts.append(f"{date}: {desc} - ${amount:.2f}\n")
         
-        self.info_text.delete(1.0, tk.END)
-        self.info_text.insert(1.0, info)
+        info = "".join(parts)
+        self._show_text(self.info_text, info)
 
 def main():
     """Main function to run the application"""
-    try:
-        # Check for required modules
-        import matplotlib
-        import pandas
-        print("All required modules found!")
-    except ImportError as e:
-        print(f"Missing required module: {e}")
+    # Check for required modules; find_spec locates them without importing them
+    if importlib.util.find_spec("matplotlib") is None:
+        print("Missing required module: matplotlib")
         print("Please install required packages:")
-        print("pip install matplotlib pandas")
+        print("pip install matplotlib")
         return
+    print("All required modules found!")
     
     root = tk.Tk()
-    app = BudgetApp(root)
+    try:
+        app = BudgetApp(root)
+    except sqlite3.DatabaseError as e:
+        messagebox.showerror("Database Error", str(e))
+        root.destroy()
+        return
     
-    # Process recurring transactions on startup
-    processed = app.db_manager.process_recurring_transactions()
+    # Report the recurring transactions BudgetApp caught up on at startup
+    processed = app.recurring_processed
     if processed > 0:
         messagebox.showinfo("Recurring Transactions", 
                            f"Processed {processed} recurring transactions")
     
     root.mainloop()
+    app.db_manager.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file